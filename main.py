@@ -2,50 +2,181 @@ import subprocess
 import os
 import sys
 import argparse
+import asyncio
+import gzip
+import importlib.util
+import itertools
+import json
+import pickle
+import queue
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from datetime import datetime
 
-# Create directories
+# Output directory; created lazily so importing the module (e.g. for
+# validate_time_format alone) costs no syscalls and works read-only
 data_dir = Path("data")
-data_dir.mkdir(parents=True, exist_ok=True)
+
+# Verbose yt-dlp logging and extra diagnostics; enabled by --debug
+debug_mode = False
+
+# Directory for intermediate downloads (--tmp-dir); pointing this at a
+# tmpfs like /dev/shm keeps the full video in RAM so the cut reads from
+# page cache and the SSD only ever sees the cut output
+tmp_dir = None
+
+
+def download_target(filename):
+    """
+    Return (directory, filename) for an intermediate download.
+
+    Without --tmp-dir this is just data_dir/filename. With it, a uniquely
+    named temp file is reserved in the tmp dir; the caller is expected to
+    delete it once the cut is done.
+    """
+    if tmp_dir is None:
+        return data_dir, filename
+    # Reserve a unique name but remove the file itself: a 0-byte file at
+    # the outtmpl path makes yt-dlp treat the video as already downloaded
+    # and skip the download entirely
+    fd, name = tempfile.mkstemp(
+        dir=tmp_dir, prefix=Path(filename).stem + "_", suffix=".mp4"
+    )
+    os.close(fd)
+    os.unlink(name)
+    path = Path(name)
+    return path.parent, path.name
+
+# On-disk cache of yt-dlp info dicts, keyed by video ID
+info_cache_dir = data_dir / ".ytdlp_cache"
+INFO_CACHE_TTL = 24 * 60 * 60  # seconds
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})")
+
+
+def _info_cache_path(url):
+    """Return the cache file for a URL, or None if no video ID is found"""
+    match = _VIDEO_ID_RE.search(url)
+    if not match:
+        return None
+    return info_cache_dir / f"{match.group(1)}.info.pkl.gz"
+
+
+def load_cached_info(url):
+    """
+    Load a cached yt-dlp info dict for a URL, or None if missing/stale.
+
+    A fresh cache entry means both metadata round-trips to YouTube can be
+    skipped on repeat runs of the same video.
+    """
+    cache_path = _info_cache_path(url)
+    if cache_path is None:
+        return None
+    try:
+        if time.time() - cache_path.stat().st_mtime > INFO_CACHE_TTL:
+            return None
+        with gzip.open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def save_cached_info(url, info):
+    """Persist a yt-dlp info dict for later runs; failures are non-fatal"""
+    cache_path = _info_cache_path(url)
+    if cache_path is None or info is None:
+        return
+    try:
+        info_cache_dir.mkdir(parents=True, exist_ok=True)
+        with gzip.open(cache_path, "wb") as f:
+            pickle.dump(info, f)
+    except (OSError, pickle.PicklingError):
+        pass
+
+
+def file_size(path):
+    """Return a file's size in bytes with a single stat, or None if missing"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+DEPS_CACHE_TTL = 24 * 60 * 60  # seconds
 
 
 def check_dependencies():
-    """Check if required dependencies are installed"""
-    dependencies = {"yt-dlp": False, "ffmpeg": False}
+    """
+    Check if required dependencies are installed.
+
+    The outcome is cached in data/.deps_cache.json for 24h (invalidated
+    if the ffmpeg binary changes), so repeat invocations skip the
+    subprocess probe entirely.
+    """
+    cache_path = data_dir / ".deps_cache.json"
+    ffmpeg_path = shutil.which("ffmpeg")
+    ffmpeg_mtime = os.stat(ffmpeg_path).st_mtime if ffmpeg_path else None
 
-    # Check for yt-dlp
+    # Only short-circuit on a cached success: a cached failure would
+    # suppress the yt-dlp install retry for the whole TTL
     try:
-        import yt_dlp
+        with open(cache_path) as f:
+            cache = json.load(f)
+        if (
+            time.time() - cache["checked_at"] < DEPS_CACHE_TTL
+            and cache["yt-dlp"]
+            and cache["ffmpeg"]
+            and cache["ffmpeg_mtime"] == ffmpeg_mtime
+            and importlib.util.find_spec("yt_dlp") is not None
+        ):
+            return True, {"yt-dlp": True, "ffmpeg": True}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    dependencies = {"yt-dlp": False, "ffmpeg": False}
 
+    # find_spec answers "is it installed?" without paying the import cost
+    if importlib.util.find_spec("yt_dlp") is not None:
         dependencies["yt-dlp"] = True
-    except ImportError:
+    else:
         print("yt-dlp is not installed. Installing...")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "yt-dlp"])
-            import yt_dlp
-
-            dependencies["yt-dlp"] = True
-            print("yt-dlp installed successfully")
+            importlib.invalidate_caches()
+            dependencies["yt-dlp"] = importlib.util.find_spec("yt_dlp") is not None
+            if dependencies["yt-dlp"]:
+                print("yt-dlp installed successfully")
         except Exception as e:
             print(f"Failed to install yt-dlp: {e}")
 
-    # Check for ffmpeg
-    try:
-        result = subprocess.run(
-            ["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        if result.returncode == 0:
-            dependencies["ffmpeg"] = True
-        else:
-            print("ffmpeg is installed but returned an error.")
-    except FileNotFoundError:
+    # shutil.which answers "is ffmpeg on PATH?" without a fork/exec;
+    # a full -version probe bought nothing beyond that boolean
+    dependencies["ffmpeg"] = ffmpeg_path is not None
+    if not dependencies["ffmpeg"]:
         print("ffmpeg is not installed or not in PATH")
 
+    try:
+        with open(cache_path, "w") as f:
+            json.dump(
+                {
+                    "yt-dlp": dependencies["yt-dlp"],
+                    "ffmpeg": dependencies["ffmpeg"],
+                    "ffmpeg_mtime": ffmpeg_mtime,
+                    "checked_at": time.time(),
+                },
+                f,
+            )
+    except OSError:
+        pass
+
     return all(dependencies.values()), dependencies
 
 
-def download_video(url, output_path, filename):
+def download_video(url, output_path, filename, done_queue=None):
     """
     Download video with the highest quality using yt-dlp.
 
@@ -53,6 +184,10 @@ def download_video(url, output_path, filename):
         url: YouTube URL
         output_path: Path to save the video
         filename: Name of the output file
+        done_queue: Optional queue.Queue; the downloaded file path is pushed
+            onto it as soon as yt-dlp reports the file is finished, so a
+            consumer (e.g. cut_video) can start while post-processing and
+            any further downloads continue
 
     Returns:
         Path to the downloaded video
@@ -63,32 +198,82 @@ def download_video(url, output_path, filename):
         print("Error: yt-dlp is required but not installed.")
         return None
 
+    output_path.mkdir(parents=True, exist_ok=True)
     full_output_path = output_path / filename
 
     # Options for yt-dlp
     ydl_opts = {
         "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",  # More flexible format selection
         "outtmpl": str(full_output_path),
-        "quiet": False,
-        "no_warnings": False,
+        "quiet": not debug_mode,
+        "no_warnings": not debug_mode,
         "ignoreerrors": True,
-        "verbose": True,  # Add verbose output for debugging
+        "verbose": debug_mode,
+        "cachedir": str(info_cache_dir),  # Persist signature/player caches
+        # Parallelize DASH/HLS fragment fetches; for plain HTTP formats,
+        # chunked Range requests give the same overlap
+        "concurrent_fragment_downloads": 8,
+        "http_chunk_size": 10 * 1024 * 1024,
+        "retries": 10,
+        "fragment_retries": 10,
     }
 
+    if done_queue is not None:
+        enqueued = False
+
+        def _enqueue_if_ready(d):
+            # The per-file 'finished' event fires once per downloaded part
+            # (before the bestvideo+bestaudio merge), so only hand off once
+            # the final merged file actually exists on disk
+            nonlocal enqueued
+            if (
+                not enqueued
+                and d.get("status") == "finished"
+                and file_size(full_output_path) is not None
+            ):
+                enqueued = True
+                done_queue.put(full_output_path)
+
+        ydl_opts["progress_hooks"] = [_enqueue_if_ready]
+        ydl_opts["postprocessor_hooks"] = [_enqueue_if_ready]
+
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             print(f"Attempting to download from {url}...")
-            info = ydl.extract_info(url, download=False)
-            print(f"Found video: {info.get('title', 'Unknown title')}")
-            print(
-                f"Available formats: {[f['format'] for f in info.get('formats', [])][:3]}..."
-            )
-            ydl.download([url])
+            info = load_cached_info(url)
+            if info is not None:
+                # Cached metadata: hand the info dict straight to the
+                # downloader, no extraction round-trip needed
+                print(f"Found video (cached): {info.get('title', 'Unknown title')}")
+                ydl.process_ie_result(info, download=True)
+                if file_size(full_output_path) is None:
+                    # The format URLs inside the info dict are signed and
+                    # expire after a few hours, well inside the cache TTL.
+                    # If the cached attempt produced no file, re-extract
+                    # fresh instead of failing the run
+                    print("Cached video info looks stale; refreshing...")
+                    info = None
+            if info is None:
+                info = ydl.extract_info(url, download=False)
+                print(f"Found video: {info.get('title', 'Unknown title')}")
+                if debug_mode:
+                    # islice short-circuits after three entries instead of
+                    # materializing the whole formats list for a slice
+                    formats = info.get("formats", ())
+                    sample = list(
+                        itertools.islice((f["format"] for f in formats), 3)
+                    )
+                    print(f"Available formats ({len(formats)}): {sample}...")
+                save_cached_info(url, info)
+                # Reuse the info dict we just fetched; ydl.download would
+                # re-run the whole extractor pass (player JS fetch,
+                # signature solving) for the same URL
+                ydl.process_ie_result(info, download=True)
 
-        if os.path.exists(full_output_path):
-            file_size = os.path.getsize(full_output_path)
+        size = file_size(full_output_path)
+        if size is not None:
             print(
-                f"Successfully downloaded video to {full_output_path} (Size: {file_size/1024/1024:.2f} MB)"
+                f"Successfully downloaded video to {full_output_path} (Size: {size/1024/1024:.2f} MB)"
             )
             return full_output_path
         else:
@@ -99,51 +284,436 @@ def download_video(url, output_path, filename):
         return None
 
 
-def cut_video(input_file, output_file, start_time, end_time):
+async def run_ffmpeg_async(command):
     """
-    Extracts a portion of a video using FFmpeg.
+    Run an FFmpeg command, streaming its stderr instead of buffering it.
+
+    Holding stderr in a PIPE until the process exits costs tens of MB on
+    long encodes and hides errors until completion. Drain it line by line
+    through asyncio's StreamReader, keeping only a rolling tail for error
+    reporting. `-nostats` suppresses the per-frame progress firehose.
+
+    Returns:
+        (returncode, stderr_tail) with the last 64 lines of stderr.
+    """
+    command = [command[0], "-nostats"] + command[1:]
+    proc = await asyncio.create_subprocess_exec(
+        *command, stderr=asyncio.subprocess.PIPE
+    )
+    tail = deque(maxlen=64)
+
+    async def _drain():
+        while True:
+            line = await proc.stderr.readline()
+            if not line:
+                break
+            tail.append(line.decode(errors="replace").rstrip())
+
+    drain_task = asyncio.ensure_future(_drain())
+    await proc.wait()
+    await drain_task
+    return proc.returncode, "\n".join(tail)
+
+
+# Cached set of encoders reported by the local ffmpeg build
+_available_encoders = None
+
+
+def detect_encoders():
+    """
+    Return the set of encoder names supported by the local ffmpeg build.
+
+    Runs `ffmpeg -hide_banner -encoders` once and caches the result for
+    the rest of the process.
+    """
+    global _available_encoders
+    if _available_encoders is not None:
+        return _available_encoders
+
+    _available_encoders = set()
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return _available_encoders
+
+    in_list = False
+    for line in result.stdout.splitlines():
+        if line.strip().startswith("---"):
+            in_list = True
+            continue
+        if not in_list:
+            continue
+        fields = line.split()
+        if len(fields) >= 2:
+            _available_encoders.add(fields[1])
+
+    return _available_encoders
+
+
+def hardware_encode_commands(input_file, output_file, start_sec, duration):
+    """
+    Build FFmpeg commands for whichever hardware H.264 encoders are
+    available, fastest first.
+
+    GPU video engines (NVENC, VAAPI, VideoToolbox) encode at 5-10x
+    real time without touching the CPU, so when a re-encode is needed
+    they should be tried before libx264.
+
+    Returns:
+        List of FFmpeg command lists (possibly empty).
+    """
+    encoders = detect_encoders()
+    commands = []
+
+    if "h264_nvenc" in encoders:
+        commands.append(
+            [
+                "ffmpeg",
+                "-y",
+                # Decode on the GPU too, so frames never round-trip
+                # through system RAM
+                "-hwaccel",
+                "cuda",
+                "-hwaccel_output_format",
+                "cuda",
+                "-ss",
+                str(start_sec),
+                "-i",
+                str(input_file),
+                "-t",
+                str(duration),
+                "-c:v",
+                "h264_nvenc",
+                "-preset",
+                "p4",
+                "-rc",
+                "vbr",
+                "-cq",
+                "23",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "128k",
+                str(output_file),
+            ]
+        )
+
+    if "h264_vaapi" in encoders:
+        commands.append(
+            [
+                "ffmpeg",
+                "-y",
+                "-vaapi_device",
+                "/dev/dri/renderD128",
+                "-ss",
+                str(start_sec),
+                "-i",
+                str(input_file),
+                "-t",
+                str(duration),
+                "-vf",
+                "format=nv12,hwupload",
+                "-c:v",
+                "h264_vaapi",
+                "-qp",
+                "23",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "128k",
+                str(output_file),
+            ]
+        )
+
+    if "h264_videotoolbox" in encoders:
+        commands.append(
+            [
+                "ffmpeg",
+                "-y",
+                "-ss",
+                str(start_sec),
+                "-i",
+                str(input_file),
+                "-t",
+                str(duration),
+                "-c:v",
+                "h264_videotoolbox",
+                "-b:v",
+                "5M",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "128k",
+                str(output_file),
+            ]
+        )
+
+    return commands
+
+
+def probe_video_stream(input_file):
+    """
+    Probe the input's first video stream with a single ffprobe pass.
+
+    Returns:
+        Dict with codec_name, width, height and r_frame_rate, or None
+        if probing fails.
+    """
+    command = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name,width,height,r_frame_rate",
+        "-of",
+        "json",
+        str(input_file),
+    ]
+    try:
+        result = subprocess.run(
+            command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        streams = json.loads(result.stdout).get("streams", [])
+        return streams[0] if streams else None
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        return None
+
+
+def snap_to_keyframe(input_file, start_sec):
+    """
+    Snap a start time down to the nearest video keyframe.
+
+    Stream-copy cuts can only begin on a keyframe; seeking to any other
+    point leaves frozen/garbled frames at the start of the output. Probing
+    the keyframe list once lets the copy cut be frame-exact.
 
     Args:
         input_file: Path to the input video file
+        start_sec: Requested start time in seconds
+
+    Returns:
+        The PTS (in seconds) of the last keyframe at or before start_sec,
+        or start_sec unchanged if probing fails.
+    """
+    command = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-skip_frame",
+        "nokey",
+        "-show_entries",
+        "frame=pts_time",
+        "-of",
+        "csv=p=0",
+        str(input_file),
+    ]
+    try:
+        result = subprocess.run(
+            command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return start_sec
+
+    best = None
+    for line in result.stdout.splitlines():
+        line = line.strip().rstrip(",")
+        if not line:
+            continue
+        try:
+            pts = float(line)
+        except ValueError:
+            continue
+        if pts <= start_sec and (best is None or pts > best):
+            best = pts
+
+    return best if best is not None else start_sec
+
+
+_TIME_RE = re.compile(r"^\d{1,2}:\d{2}:\d{2}$")
+
+
+def time_to_seconds(time_str):
+    """Convert a `HH:MM:SS` string to seconds"""
+    h, m, s = map(int, time_str.split(":"))
+    return h * 3600 + m * 60 + s
+
+
+def bridge_pipes(src, dst, chunk_size=1 << 20):
+    """
+    Move bytes from one pipe to another without copying them into Python.
+
+    On Linux, os.splice shifts whole pages between the pipes inside the
+    kernel, so the data never crosses the user/kernel boundary. Elsewhere,
+    a large readinto/write loop over a reusable memoryview at least avoids
+    a fresh bytes allocation per chunk.
+
+    Returns:
+        Total number of bytes moved.
+    """
+    total = 0
+    if hasattr(os, "splice"):
+        src_fd = src.fileno()
+        dst_fd = dst.fileno()
+        while True:
+            try:
+                moved = os.splice(src_fd, dst_fd, chunk_size)
+            except OSError:
+                break
+            if moved == 0:
+                break
+            total += moved
+        return total
+
+    buf = memoryview(bytearray(chunk_size))
+    while True:
+        n = src.readinto(buf)
+        if not n:
+            break
+        try:
+            dst.write(buf[:n])
+        except BrokenPipeError:
+            break
+        total += n
+    return total
+
+
+def stream_cut_video(url, output_file, start_time, end_time):
+    """
+    Download and cut in a single pass by piping yt-dlp straight into
+    FFmpeg, so the full video never touches disk.
+
+    Requires a single-file format selection (`best[ext=mp4]`) since
+    merging separate video+audio streams cannot be piped. The start seek
+    is an output-side option because pipe input is not seekable.
+
+    Args:
+        url: YouTube URL
         output_file: Path to the output video file
         start_time: Start time of the cut in `HH:MM:SS` format
         end_time: End time of the cut in `HH:MM:SS` format
+
+    Returns:
+        True if the cut succeeded
+    """
+    start_sec = time_to_seconds(start_time)
+    duration = time_to_seconds(end_time) - start_sec
+
+    yt_dlp_command = [
+        sys.executable,
+        "-m",
+        "yt_dlp",
+        "-f",
+        "best[ext=mp4]",
+        "-o",
+        "-",
+        url,
+    ]
+    ffmpeg_command = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        "pipe:0",
+        "-ss",
+        str(start_sec),
+        "-t",
+        str(duration),
+        "-c",
+        "copy",
+        "-avoid_negative_ts",
+        "make_zero",
+        str(output_file),
+    ]
+
+    print(f"Streaming {url} into FFmpeg...")
+    print(" ".join(yt_dlp_command), "|", " ".join(ffmpeg_command))
+
+    # >=1MB pipe buffers keep syscall overhead down on large streams
+    yt_dlp_proc = subprocess.Popen(
+        yt_dlp_command, stdout=subprocess.PIPE, bufsize=1 << 20
+    )
+    ffmpeg_proc = subprocess.Popen(
+        ffmpeg_command,
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20,
+    )
+
+    # Drain ffmpeg's stderr in a side thread so its pipe can't fill up
+    # and stall the encode while we pump bytes below
+    stderr_tail = deque(maxlen=64)
+
+    def _drain():
+        for line in ffmpeg_proc.stderr:
+            stderr_tail.append(line.decode(errors="replace").rstrip())
+
+    drain_thread = threading.Thread(target=_drain)
+    drain_thread.start()
+
+    streamed = bridge_pipes(yt_dlp_proc.stdout, ffmpeg_proc.stdin)
+
+    yt_dlp_proc.stdout.close()
+    ffmpeg_proc.stdin.close()
+    drain_thread.join()
+    ffmpeg_proc.wait()
+    yt_dlp_proc.wait()
+
+    if ffmpeg_proc.returncode != 0:
+        print(f"FFmpeg failed with code {ffmpeg_proc.returncode}")
+        print(f"FFmpeg error output: {chr(10).join(stderr_tail)}")
+        return False
+
+    print(f"Streamed {streamed/1024/1024:.2f} MB without touching disk")
+    print(f"Successfully cut video to {output_file}")
+    return True
+
+
+async def cut_video_async(input_file, output_file, start_time, end_time):
     """
+    Extracts a portion of a video using FFmpeg.
 
-    def time_to_seconds(time_str):
-        t = datetime.strptime(time_str, "%H:%M:%S")
-        return t.hour * 3600 + t.minute * 60 + t.second
+    The ffprobe preflights run in worker threads and FFmpeg itself is an
+    asyncio subprocess, so several cuts can run concurrently under one
+    event loop without blocking each other.
+
+    Args:
+        input_file: Path to the input video file
+        output_file: Path to the output video file
+        start_time: Start time of the cut in `HH:MM:SS` format
+        end_time: End time of the cut in `HH:MM:SS` format
+    """
 
     start_sec = time_to_seconds(start_time)
     end_sec = time_to_seconds(end_time)
-    duration = end_sec - start_sec
 
-    # More compatible FFmpeg command with fallback options
-    commands = [
-        # First attempt: High quality with specified codecs
-        [
-            "ffmpeg",
-            "-y",
-            "-ss",
-            str(start_sec),
-            "-i",
-            str(input_file),
-            "-t",
-            str(duration),
-            "-c:v",
-            "libx264",
-            "-crf",
-            "23",
-            "-preset",
-            "medium",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "128k",
-            str(output_file),
-        ],
-        # Second attempt: Copy codec (faster but may have accuracy issues at cut points)
-        [
+    # Decide the right command upfront from one ffprobe pass, rather
+    # than discovering it through full attempts that fail partway in
+    stream_info = await asyncio.to_thread(probe_video_stream, input_file)
+    copy_safe = stream_info is not None and stream_info.get("codec_name") in {
+        "h264",
+        "hevc",
+        "av1",
+        "mpeg4",
+    }
+
+    if copy_safe:
+        # Snap the start down to a keyframe so the stream-copy cut is
+        # frame-exact. Re-encode paths seek frame-accurately on their own,
+        # so they keep the requested start (and skip the whole-file
+        # keyframe scan entirely)
+        start_sec = await asyncio.to_thread(snap_to_keyframe, input_file, start_sec)
+        duration = end_sec - start_sec
+        # Stream copy: no encoder work, near disk-copy speed
+        primary = [
             "ffmpeg",
             "-y",
             "-ss",
@@ -154,9 +724,60 @@ def cut_video(input_file, output_file, start_time, end_time):
             str(duration),
             "-c",
             "copy",
+            "-movflags",
+            "+faststart",
+            "-avoid_negative_ts",
+            "make_zero",
             str(output_file),
-        ],
-        # Last resort: Basic settings
+        ]
+        commands = [primary]
+    else:
+        duration = end_sec - start_sec
+        # Re-encode needed. ffmpeg -encoders only reports compile-time
+        # support, not a usable device (nvenc can be built in with no
+        # NVIDIA GPU present), so keep the whole preference chain: each
+        # hardware encoder in order, then the tuned libx264
+        commands = hardware_encode_commands(
+            input_file, output_file, start_sec, duration
+        )
+        # Explicit thread counts: ffmpeg's auto-selection underuses
+        # hyperthreaded boxes, and sliced threading splits each frame
+        # across cores instead of bottlenecking on the lookahead window
+        cpu_count = str(os.cpu_count() or 1)
+        commands.append(
+            [
+                "ffmpeg",
+                "-y",
+                "-threads",
+                "0",
+                "-filter_threads",
+                cpu_count,
+                "-filter_complex_threads",
+                cpu_count,
+                "-ss",
+                str(start_sec),
+                "-i",
+                str(input_file),
+                "-t",
+                str(duration),
+                "-c:v",
+                "libx264",
+                "-crf",
+                "23",
+                "-preset",
+                "medium",
+                "-x264-params",
+                "threads=auto:sliced-threads=1:lookahead-threads=2",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "128k",
+                str(output_file),
+            ]
+        )
+
+    # Last resort: Basic settings, in case the preflight misjudged
+    commands.append(
         [
             "ffmpeg",
             "-y",
@@ -167,36 +788,39 @@ def cut_video(input_file, output_file, start_time, end_time):
             "-t",
             str(duration),
             str(output_file),
-        ],
-    ]
+        ]
+    )
 
     success = False
     for i, command in enumerate(commands):
-        try:
-            print(f"Attempt {i+1}: Running FFmpeg...")
-            print(" ".join(command))
-            result = subprocess.run(
-                command, check=True, stderr=subprocess.PIPE, text=True
-            )
+        print(f"Attempt {i+1}: Running FFmpeg...")
+        print(" ".join(command))
+        returncode, stderr_tail = await run_ffmpeg_async(command)
+        if returncode == 0:
             success = True
             print(f"Successfully cut video to {output_file}")
             break
-        except subprocess.CalledProcessError as e:
-            print(f"Attempt {i+1} failed: {e}")
-            print(f"FFmpeg error output: {e.stderr}")
-            if i == len(commands) - 1:
-                print("All cutting attempts failed")
+        print(f"Attempt {i+1} failed with code {returncode}")
+        print(f"FFmpeg error output: {stderr_tail}")
+        if i == len(commands) - 1:
+            print("All cutting attempts failed")
 
     return success
 
 
+def cut_video(input_file, output_file, start_time, end_time):
+    """Blocking wrapper around cut_video_async for synchronous callers"""
+    return asyncio.run(cut_video_async(input_file, output_file, start_time, end_time))
+
+
 def validate_time_format(time_str):
     """Validate if the time string is in HH:MM:SS format"""
-    try:
-        datetime.strptime(time_str, "%H:%M:%S")
-        return True
-    except ValueError:
+    if _TIME_RE.match(time_str) is None:
         return False
+    # The regex only checks the shape; strptime also rejected
+    # out-of-range minutes/seconds like 00:99:99
+    _, m, s = map(int, time_str.split(":"))
+    return m < 60 and s < 60
 
 
 def get_user_input():
@@ -204,7 +828,9 @@ def get_user_input():
     parser = argparse.ArgumentParser(description="Download and cut a YouTube video")
 
     # Add command-line arguments
-    parser.add_argument("--url", type=str, help="YouTube video URL")
+    parser.add_argument(
+        "--url", type=str, nargs="+", help="YouTube video URL(s)"
+    )
     parser.add_argument("--name", type=str, help="Output video filename")
     parser.add_argument("--start", type=str, help="Start time (HH:MM:SS)")
     parser.add_argument("--end", type=str, help="End time (HH:MM:SS)")
@@ -216,13 +842,80 @@ def get_user_input():
     parser.add_argument(
         "--skip-cut", action="store_true", help="Skip cutting, download only"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Pipe the download straight into FFmpeg (no intermediate file)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Enable verbose yt-dlp output"
+    )
+    parser.add_argument(
+        "--tmp-dir",
+        type=str,
+        help="Directory for intermediate downloads (e.g. /dev/shm to keep them in RAM)",
+    )
+    parser.add_argument(
+        "--urls-file",
+        type=str,
+        help="File with one YouTube URL per line (batch mode)",
+    )
+    parser.add_argument(
+        "--cuts-json",
+        type=str,
+        help="JSON file with a list of {url, name, start, end} cut jobs",
+    )
 
     args = parser.parse_args()
 
+    global debug_mode, tmp_dir
+    debug_mode = args.debug
+    if args.tmp_dir:
+        tmp_dir = Path(args.tmp_dir)
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    # Batch job list: every item carries its own name and cut times
+    cuts = None
+    if args.cuts_json:
+        if args.skip_download:
+            print("Error: --skip-download cannot be combined with --cuts-json")
+            sys.exit(1)
+        with open(args.cuts_json) as f:
+            cuts = json.load(f)
+        for item in cuts:
+            if not isinstance(item, dict):
+                print(f"Error: cut job is not an object: {item}")
+                sys.exit(1)
+            for key in ("url", "name", "start", "end"):
+                if not isinstance(item.get(key), str):
+                    print(f"Error: cut job missing string '{key}': {item}")
+                    sys.exit(1)
+            if not item["name"].endswith(".mp4"):
+                item["name"] += ".mp4"
+            if not (
+                validate_time_format(item["start"])
+                and validate_time_format(item["end"])
+            ):
+                print(f"Error: invalid time format in cut job: {item}")
+                sys.exit(1)
+        return (
+            [],
+            None,
+            None,
+            None,
+            args.skip_download,
+            args.skip_cut,
+            args.stream,
+            cuts,
+        )
+
     # If arguments weren't provided via command line, prompt the user
-    video_url = args.url
-    if not video_url and not args.skip_download:
-        video_url = input("Enter YouTube video URL: ")
+    video_urls = args.url or []
+    if args.urls_file:
+        with open(args.urls_file) as f:
+            video_urls.extend(line.strip() for line in f if line.strip())
+    if not video_urls and not args.skip_download:
+        video_urls = [input("Enter YouTube video URL: ")]
 
     video_name = args.name
     if not video_name:
@@ -245,19 +938,139 @@ def get_user_input():
                 print("Invalid time format. Please use HH:MM:SS")
 
     return (
-        video_url,
+        video_urls,
         video_name,
         start_time,
         end_time,
         args.skip_download,
         args.skip_cut,
+        args.stream,
+        None,
+    )
+
+
+def download_and_cut(video_url, video_name, start_time, end_time, skip_cut):
+    """
+    Download a single video and cut it, overlapping the two stages.
+
+    The cut runs in a separate thread that blocks on a queue; the download
+    pushes the finished file path onto the queue so the (CPU-bound) FFmpeg
+    cut starts as soon as the (network-bound) download has the file on disk.
+
+    Returns:
+        Path to the cut video (or the downloaded video if skip_cut), or
+        None on failure.
+    """
+    done_queue = queue.Queue()
+    result = {}
+
+    output_video = data_dir / f"cut_{video_name}"
+
+    def _cut_worker():
+        input_video = done_queue.get()
+        if input_video is None:
+            return
+        print(f"\nCutting video from {start_time} to {end_time}")
+        result["success"] = cut_video(input_video, output_video, start_time, end_time)
+
+    cutter = None
+    if not skip_cut:
+        cutter = threading.Thread(target=_cut_worker)
+        cutter.start()
+
+    # Keep the download in data_dir when it is the final product; route
+    # it through --tmp-dir when it is only an intermediate for the cut
+    download_dir, download_name = (
+        (data_dir, video_name) if skip_cut else download_target(video_name)
+    )
+
+    print(f"\nDownloading video from: {video_url}")
+    input_video = download_video(
+        video_url, download_dir, download_name, done_queue=None if skip_cut else done_queue
     )
 
+    if cutter is not None:
+        # Always hand the cutter a result: the hooks never fire when
+        # yt-dlp finds the file already downloaded, and never fire with
+        # the final path if the download failed. A duplicate entry is
+        # harmless since the cutter only consumes one.
+        done_queue.put(input_video)
+        cutter.join()
+        if input_video is not None and download_dir is not data_dir:
+            os.unlink(input_video)
+
+    if input_video is None:
+        return None
+    if skip_cut:
+        return input_video
+    if result.get("success") and file_size(output_video) is not None:
+        return output_video
+    return None
+
+
+async def _process_batch_async(cuts, skip_cut):
+    # Downloads are network-bound: four at a time is plenty. Encodes are
+    # bounded to half the cores since each ffmpeg is itself multithreaded
+    # and more would just oversubscribe the box.
+    download_slots = asyncio.Semaphore(4)
+    encode_slots = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
+
+    async def _one(item):
+        download_dir, download_name = (
+            (data_dir, item["name"]) if skip_cut else download_target(item["name"])
+        )
+        async with download_slots:
+            input_video = await asyncio.to_thread(
+                download_video, item["url"], download_dir, download_name
+            )
+        if input_video is None or skip_cut:
+            return input_video
+        output_video = data_dir / f"cut_{item['name']}"
+        print(f"\nCutting video from {item['start']} to {item['end']}")
+        async with encode_slots:
+            cut_ok = await cut_video_async(
+                input_video, output_video, item["start"], item["end"]
+            )
+        if download_dir is not data_dir:
+            os.unlink(input_video)
+        if cut_ok and file_size(output_video) is not None:
+            return output_video
+        return None
+
+    results = await asyncio.gather(
+        *(_one(item) for item in cuts), return_exceptions=True
+    )
+    for i, result in enumerate(results):
+        if isinstance(result, BaseException):
+            print(f"Error processing {cuts[i]['url']}: {result}")
+            results[i] = None
+    return results
+
+
+def process_batch(cuts, skip_cut=False):
+    """
+    Process several cut jobs concurrently under one asyncio event loop.
+
+    Downloads run in worker threads (the yt-dlp API is blocking) while
+    FFmpeg cuts are asyncio subprocesses, with semaphores bounding each
+    stage. A failed item never blocks the rest.
+
+    Args:
+        cuts: List of dicts with `url`, `name`, `start` and `end` keys
+        skip_cut: Download only, skip the FFmpeg step
+
+    Returns:
+        List of output paths (None entries for failed items).
+    """
+    return asyncio.run(_process_batch_async(cuts, skip_cut))
+
 
 if __name__ == "__main__":
     print("Video Downloader and Cutter Tool")
     print("================================")
 
+    data_dir.mkdir(parents=True, exist_ok=True)
+
     # Check dependencies
     all_deps_installed, deps_status = check_dependencies()
     if not all_deps_installed:
@@ -272,41 +1085,88 @@ if __name__ == "__main__":
             sys.exit(1)
 
     # Get user input
-    video_url, video_name, start_time, end_time, skip_download, skip_cut = (
-        get_user_input()
-    )
+    (
+        video_urls,
+        video_name,
+        start_time,
+        end_time,
+        skip_download,
+        skip_cut,
+        stream,
+        cuts,
+    ) = get_user_input()
+
+    if stream and video_urls and not skip_download and not skip_cut:
+        # Pipe each download straight into FFmpeg; nothing hits data/
+        # except the cut output itself
+        base, ext = os.path.splitext(video_name)
+        failed = False
+        for i, url in enumerate(video_urls):
+            name = video_name if len(video_urls) == 1 else f"{base}_{i + 1}{ext}"
+            output_video = data_dir / f"cut_{name}"
+            if stream_cut_video(url, output_video, start_time, end_time):
+                print(f"\nVideo cut successfully. Output saved to: {output_video}")
+                print(f"File size: {file_size(output_video)/1024/1024:.2f} MB")
+            else:
+                print(f"\nFailed to stream-cut {url}")
+                failed = True
+        sys.exit(1 if failed else 0)
 
-    input_video = None
     if skip_download:
         # Use existing file
         input_video = data_dir / video_name
-        if not os.path.exists(input_video):
+        if file_size(input_video) is None:
             print(
                 f"Error: File {input_video} does not exist for --skip-download option."
             )
             sys.exit(1)
         print(f"Using existing video file: {input_video}")
-    else:
-        # Download video
-        print(f"\nDownloading video from: {video_url}")
-        input_video = download_video(video_url, data_dir, video_name)
 
-    if input_video and os.path.exists(input_video):
         if skip_cut:
-            print(f"Download complete. Skipping cutting as requested.")
+            print(f"Nothing to do. Skipping cutting as requested.")
             sys.exit(0)
 
-        # Generate output filename
-        output_video_name = f"cut_{video_name}"
-        output_video = data_dir / output_video_name
-
+        output_video = data_dir / f"cut_{video_name}"
         print(f"\nCutting video from {start_time} to {end_time}")
         success = cut_video(input_video, output_video, start_time, end_time)
 
-        if success and os.path.exists(output_video):
+        output_size = file_size(output_video) if success else None
+        if output_size is not None:
             print(f"\nVideo cut successfully. Output saved to: {output_video}")
-            print(f"File size: {os.path.getsize(output_video)/1024/1024:.2f} MB")
+            print(f"File size: {output_size/1024/1024:.2f} MB")
         else:
             print("\nFailed to create cut video")
+    elif cuts or len(video_urls) > 1:
+        # Batch mode: overlap downloads and cuts across items
+        if cuts is None:
+            base, ext = os.path.splitext(video_name)
+            cuts = [
+                {
+                    "url": url,
+                    "name": f"{base}_{i + 1}{ext}",
+                    "start": start_time,
+                    "end": end_time,
+                }
+                for i, url in enumerate(video_urls)
+            ]
+        results = process_batch(cuts, skip_cut)
+        for item, output_video in zip(cuts, results):
+            if output_video:
+                print(f"\n{item['url']} -> {output_video}")
+                print(f"File size: {file_size(output_video)/1024/1024:.2f} MB")
+            else:
+                print(f"\nFailed to process {item['url']}")
+        if not any(results):
+            sys.exit(1)
     else:
-        print("\nFailed to download or find video")
+        output_video = download_and_cut(
+            video_urls[0], video_name, start_time, end_time, skip_cut
+        )
+        if output_video:
+            if skip_cut:
+                print(f"Download complete. Skipping cutting as requested.")
+            else:
+                print(f"\nVideo cut successfully. Output saved to: {output_video}")
+                print(f"File size: {file_size(output_video)/1024/1024:.2f} MB")
+        else:
+            print("\nFailed to download or cut video")